@@ -3,38 +3,88 @@
 import requests
 
 from . import config
+from .breaker import is_server_error, protect
 from meraki_sdk.meraki_sdk_client import MerakiSdkClient
 
 def get_camera_analytics(serial):
     return f"http://api.meraki.com/api/v0/devices/{serial}/camera/analytics/live"
 
+@protect("meraki", is_failure=is_server_error)
 def get_camera_snapshot(network, serial):
     url = f"http://api.meraki.com/api/v0/networks/{network}/cameras/{serial}/snapshot"
-    return requests.post(url, headers={"X-Cisco-Meraki-API-Key": config.MERAKI_AUTH_TOKEN})
+    return requests.post(url, headers={"X-Cisco-Meraki-API-Key": config.MERAKI_AUTH_TOKEN},
+                         timeout=config.MERAKI_API_TIMEOUT)
 
+@protect("meraki", cache=True)
+def find_camera_network_api(camera_serial):
+    client = MerakiSdkClient(config.MERAKI_AUTH_TOKEN)
+    orgs = client.organizations.get_organizations()
+    all_organizations = {}
+
+    for org in orgs:
+        all_organizations['organization_id'] = org['id']
+
+    if all_organizations:  # make sure it's not an empty collection
+        networks = client.networks.get_organization_networks(all_organizations)
+        if networks:
+            for network in networks:
+                devices = client.devices.get_network_devices(network['id'])
+                for device in devices:
+                    if device['serial'] == camera_serial:
+                        return network
+
+@protect("meraki")
+def get_all_devices_api(organization_id=None, network_id=None):
+    passFilter = False if organization_id is not None else True
+    avai_devices = []
+    client = MerakiSdkClient(config.MERAKI_AUTH_TOKEN)
+    orgs = client.organizations.get_organizations()
+    avai_orga =  [{'organization_id': orgs[x]} for x in orgs if (not passFilter and orgs[x] == organization_id) or passFilter]
+    networks = client.networks.get_organization_networks(avai_orga)
+    if networks:
+        for network in networks:
+            if network_id:
+                if network['id'] == network_id:
+                    avai_devices.append( client.devices.get_network_devices(network['id']))
+            else:
+                avai_devices.append( client.devices.get_network_devices(network['id']))
+
+    return avai_devices
+
+@protect("data_api", is_failure=is_server_error)
 def get_available_room_api(meeting_length):
     url = f"{config.DATA_API_BASE_URL}/room/available?length={meeting_length}"
-    return requests.get(url)
+    return requests.get(url, timeout=config.DATA_API_TIMEOUT)
 
+@protect("data_api", cache=True, is_failure=is_server_error)
 def attendants_suggestion_api(person_email):
     url = f"{config.DATA_API_BASE_URL}/person/suggest/{person_email}"
-    return requests.post(url)
+    return requests.post(url, timeout=config.DATA_API_TIMEOUT)
 
+@protect("data_api", is_failure=is_server_error)
 def identify_person_api(capture_url):
     url= f"{config.DATA_API_BASE_URL}/person/identify"
-    return requests.post(url, capture_url)
+    return requests.post(url, capture_url, timeout=config.DATA_API_TIMEOUT)
 
+@protect("data_api", cache=True, is_failure=is_server_error)
 def get_room_device_info_api(room):
     url = f"{config.DATA_API_BASE_URL}/room/{room}/device"
-    return requests.get(url)
+    return requests.get(url, timeout=config.DATA_API_TIMEOUT)
 
+@protect("data_api", cache=True, is_failure=is_server_error)
 def get_camera_room_api(camera_serial: str):
     url = f"{config.DATA_API_BASE_URL}/camera"
-    return requests.get(url, camera_serial)
+    return requests.get(url, camera_serial, timeout=config.DATA_API_TIMEOUT)
+
+@protect("data_api", is_failure=is_server_error)
+def get_meetings_api(start, end):
+    url = f"{config.DATA_API_BASE_URL}/meetings?start={start}&end={end}"
+    return requests.get(url, timeout=config.DATA_API_TIMEOUT)
 
+@protect("data_api", is_failure=is_server_error)
 def get_current_meeting_api(room):
     url = f"{config.DATA_API_BASE_URL}/room/{room}/now"
-    return requests.get(url)
+    return requests.get(url, timeout=config.DATA_API_TIMEOUT)
 
 """
 def get_camera_snapshot_sdk(network, serial):
@@ -1,9 +1,11 @@
 import asyncio
 import json
 import logging
+import math
 import re
 import time
-from typing import Any, Optional
+from concurrent.futures import Future
+from typing import Any, List, Optional
 
 from flask import Flask, request
 from flask_mqtt import Mqtt
@@ -11,7 +13,10 @@ import requests
 import xows
 
 from . import api, config
-from meraki_sdk.meraki_sdk_client import MerakiSdkClient
+from .breaker import CircuitOpenError, get_breaker, get_breaker_states
+from .dispatcher import T10Dispatcher
+from .occupancy import OccupancyStore
+from .schedule import MeetingIndex
 
 # Logging configuration
 logging.basicConfig(level=logging.DEBUG)
@@ -32,6 +37,10 @@ loop = asyncio.get_event_loop()
 MQTT_ZONE_RGX = re.compile(r"/merakimv/(?P<serial>[0-9A-Z-]+)/(?P<zone_id>[0-9A-Z]+)")
 # Current camera state: serial as a key and people count as value
 CAMERA_STATE = {}
+# Occupancy history: people counts aggregated by serial-zone key
+OCCUPANCY_STORE = OccupancyStore()
+# Meeting schedule index, refreshed in bulk from the data API
+MEETING_INDEX = MeetingIndex(config.ROOM_DATA, config.MEETING_INDEX_MAX_AGE)
 # Current warn state: username set
 WARN_STATE = set({})
 # Enter event enabled
@@ -73,30 +82,6 @@ def get_camera_room(camera_serial: str) -> Optional[dict]:
     return response.json()
 
 
-def get_all_devices(organization_id=None, network_id=None) -> list:
-    """Get all devices.
-
-    Returns:
-        Optional[dict]: Devices list
-    """
-
-    passFilter = False if organization_id is not None else True
-    avai_devices = []
-    client = MerakiSdkClient(config.MERAKI_AUTH_TOKEN)
-    orgs = client.organizations.get_organizations()
-    avai_orga =  [{'organization_id': orgs[x]} for x in orgs if (not passFilter and orgs[x] == organization_id) or passFilter]
-    networks = client.networks.get_organization_networks(avai_orga)
-    if networks:
-        for network in networks:
-            if network_id:
-                if network['id'] == network_id:
-                    avai_devices.append( client.devices.get_network_devices(network['id']))
-            else:
-                avai_devices.append( client.devices.get_network_devices(network['id']))
-
-    return avai_devices
-
-
 def get_camera_network(camera_serial: str) -> dict:
     """Get network associated to camera.
 
@@ -106,22 +91,10 @@ def get_camera_network(camera_serial: str) -> dict:
     Returns:
         str: Network informations
     """
-    client = MerakiSdkClient(config.MERAKI_AUTH_TOKEN)
     try:
-        orgs = client.organizations.get_organizations()
-        all_organizations = {}
-
-        for org in orgs:
-            all_organizations['organization_id'] = org['id']
-
-        if all_organizations:  # make sure it's not an empty collection
-            networks = client.networks.get_organization_networks(all_organizations)
-            if networks:
-                for network in networks:
-                    devices = client.devices.get_network_devices(network['id'])
-                    for device in devices:
-                        if device['serial'] == camera_serial:
-                            return network
+        network = api.find_camera_network_api(camera_serial)
+        if network:
+            return network
 
     except Exception as err:
         logging.error(str(err))
@@ -131,6 +104,18 @@ def get_camera_network(camera_serial: str) -> dict:
     }
 
 
+def fetch_meetings() -> list:
+    """Fetch meetings around now from the data API.
+
+    Returns:
+        list: Meetings list
+    """
+    now = int(time.time())
+    response = api.get_meetings_api(now - config.MEETING_INDEX_HORIZON, now + config.MEETING_INDEX_HORIZON)
+    response.raise_for_status()
+    return response.json()
+
+
 def get_room_meeting(room_id: str) -> Optional[dict]:
     """Get meeting associated to room.
 
@@ -140,28 +125,34 @@ def get_room_meeting(room_id: str) -> Optional[dict]:
     Returns:
         Optional[dict]: Meeting information
     """
+    if MEETING_INDEX.ready:
+        return MEETING_INDEX.current_meeting(room_id)
+
     try:
         response = api.get_current_meeting_api(room_id)
         return response.json()
     except Exception as err:
         logger.error(str(err))
 
-def get_available_room(meeting_length: int) -> Optional[dict]:
-    """Get meeting associated to room.
+def get_available_room(meeting_length: int) -> Optional[List[str]]:
+    """Get rooms available for a meeting.
 
     Args:
-        room_id (str): Room ID
+        meeting_length (int): Meeting length, in minutes
 
     Returns:
-        Optional[dict]: Meeting information
+        Optional[List[str]]: Available room IDs
     """
+    if MEETING_INDEX.ready:
+        return MEETING_INDEX.available_rooms(meeting_length)
+
     try:
-        return api.get_available_room_api(meeting_length)
+        rooms = api.get_available_room_api(meeting_length).json()
+        return [x["room"] if isinstance(x, dict) else x for x in rooms]
     except Exception as err:
         logger.error(str(err))
 
 
-
 def get_room_t10(room_id: str) -> Optional[dict]:
     """Get T10 associated to room.
 
@@ -185,8 +176,13 @@ def take_picture_from_camera(network_id: str, camera_serial: str) -> dict:
     Returns:
         dict: Picture data
     """
-    data = api.get_camera_snapshot(network_id, camera_serial)
-    if data.status_code != 202:
+    try:
+        data = api.get_camera_snapshot(network_id, camera_serial)
+    except (CircuitOpenError, requests.RequestException, ValueError) as err:
+        logger.warning(str(err))
+        data = None
+
+    if data is None or data.status_code != 202:
         # Mock data
         return {
             "url": "https://spn4.meraki.com/stream/jpeg/snapshot/b2d123asdf423qd22d2",
@@ -221,10 +217,24 @@ async def async_send_raw_message_to_t10(ip: str, username: str, password: str, m
     Returns:
         dict: Response
     """
-    async with xows.XoWSClient(ip, username, password) as client:
-        encoded_message = f"711:{message}"
-        logger.info(f"Sending message {encoded_message} to T10 {ip} ...")
-        return await client.xCommand(['Message', 'Send'], Text=encoded_message)
+    breaker = get_breaker(f"t10:{ip}")
+    if not breaker.allow_request():
+        raise CircuitOpenError(breaker.name)
+
+    async def send() -> dict:
+        async with xows.XoWSClient(ip, username, password) as client:
+            encoded_message = f"711:{message}"
+            logger.info(f"Sending message {encoded_message} to T10 {ip} ...")
+            return await client.xCommand(['Message', 'Send'], Text=encoded_message)
+
+    try:
+        response = await asyncio.wait_for(send(), config.T10_TIMEOUT)
+    except Exception:
+        breaker.record_failure()
+        raise
+
+    breaker.record_success()
+    return response
 
 
 def send_raw_message_to_t10(ip: str, username: str, password: str, message: str) -> dict:
@@ -251,37 +261,66 @@ def get_person_meeting_from_camera(camera_serial: str) -> Optional[dict]:
     Returns:
         Optional[dict]: Data
     """
-    # Get the network
-    network_data = get_camera_network(camera_serial)
-    # Get the camera capture
-    capture_data = take_picture_from_camera(network_data["id"], camera_serial)
-    # Identify person
-    person_data = identify_user(capture_data["url"])
-    # Get the room ID associated to the camera
-    room_data = get_camera_room(camera_serial)
-    # Get the T10 device associated to the room
-    t10_data = get_room_t10(room_data["room"])
-    # Get the meeting
-    meeting = get_room_meeting(room_data["room"])
+    try:
+        # Get the network
+        network_data = get_camera_network(camera_serial)
+        # Get the camera capture
+        capture_data = take_picture_from_camera(network_data["id"], camera_serial)
+        # Identify person
+        person_data = identify_user(capture_data["url"])
+        # Get the room ID associated to the camera
+        room_data = get_camera_room(camera_serial)
+        # Get the T10 device associated to the room
+        t10_data = get_room_t10(room_data["room"])
+        # Get the meeting
+        meeting = get_room_meeting(room_data["room"])
+    except (CircuitOpenError, requests.RequestException, ValueError) as err:
+        logger.warning(f"Skipping camera {camera_serial} event: {err}")
+        return None
 
     if meeting:
         return {
             't10_data': t10_data,
+            'room_id': room_data["room"],
             'username': person_data["identified_person"]
         }
 
 
-def send_json_message_to_t10(ip: str, username: str, password: str, message: dict) -> dict:
+async def async_send_json_message_to_t10(ip: str, username: str, password: str, message: dict) -> dict:
     """Send JSON message to T10.
 
     Args:
+        ip (str): Device IP
+        username (str): Username
+        password (str): Password
         message (dict): Message to send
 
     Returns:
         dict: Response
     """
     json_data = json.dumps(message)
-    return loop.run_until_complete(async_send_raw_message_to_t10(ip, username, password, json_data))
+    return await async_send_raw_message_to_t10(ip, username, password, json_data)
+
+
+def send_json_message_to_t10(ip: str, username: str, password: str, message: dict,
+                             room_id: Optional[str] = None) -> Future:
+    """Queue JSON message for T10.
+
+    Args:
+        ip (str): Device IP
+        username (str): Username
+        password (str): Password
+        message (dict): Message to send
+        room_id (Optional[str]): Room ID
+
+    Returns:
+        Future: Response
+    """
+    return T10_DISPATCHER.enqueue(ip, username, password, message, room_id)
+
+
+# Outbound T10 messages dispatcher
+T10_DISPATCHER = T10Dispatcher(async_send_json_message_to_t10, config.T10_MAX_IN_FLIGHT, config.T10_MAX_QUEUE)
 
 
 def send_json_message_to_bot(message: dict):
@@ -351,6 +390,7 @@ def handle_meraki_zone(camera_serial: str, zone_id: str, camera_data: dict):
     state_key = f"{camera_serial}-{zone_id}"
     previous_persons_count = CAMERA_STATE.get(state_key, 0)
     current_persons_count = camera_data["counts"]["person"]
+    OCCUPANCY_STORE.record(state_key, current_persons_count)
 
     if zone_name == "Far" and current_persons_count > 0:
         logger.debug(f"[DEBUG] Someone is too far in the room (camera: {camera_serial})")
@@ -386,7 +426,8 @@ def start_entered_scenario(camera_serial: str):
                     {
                         "messageId": 1,
                         'username': related_meeting_data['username']
-                    }
+                    },
+                    related_meeting_data['room_id']
                 )
 
     if RECORDING_EVENT_ENABLED:
@@ -404,7 +445,8 @@ def start_entered_scenario(camera_serial: str):
                     {
                         "messageId": 4,
                         'username': related_meeting_data['username']
-                    }
+                    },
+                    related_meeting_data['room_id']
                 )
 
 
@@ -432,6 +474,10 @@ def start_too_far_scenario(camera_serial: str):
     WARN_EVENT_TRIGGERING = True
 
     related_meeting_data = get_person_meeting_from_camera(camera_serial)
+    if not related_meeting_data:
+        WARN_EVENT_TRIGGERING = False
+        return
+
     username = related_meeting_data['username']
 
     # Already triggered
@@ -452,7 +498,8 @@ def start_too_far_scenario(camera_serial: str):
                 "messageId": 3,
                 "username": username,
                 "first": len(WARN_STATE) == 1
-            }
+            },
+            related_meeting_data['room_id']
         )
 
     # Warn
@@ -480,7 +527,8 @@ def handle_bot_message(message: dict):
                 "messageId": message_id,
                 "username": message.get("Name", None),
                 "responseChoice": int(message.get("time", "0"))
-            }
+            },
+            room_id
         )
 
 
@@ -587,6 +635,59 @@ def enable_recording_events():
     return "ok"
 
 
+@app.route('/t10-backlog', methods=["GET"])
+def t10_backlog():
+    """Get the outbound T10 messages backlog.
+
+    Returns:
+        dict: Route output
+    """
+    return T10_DISPATCHER.backlog()
+
+
+@app.route('/occupancy/<camera_serial>/<zone_id>', methods=["GET"])
+def occupancy(camera_serial: str, zone_id: str):
+    """Get zone occupancy stats over a time window.
+
+    Query args:
+        window (float): Window length until `end`, in seconds (default: 3600)
+        start (float): Window start timestamp (overrides `window`)
+        end (float): Window end timestamp (default: now)
+
+    Args:
+        camera_serial (str): Camera serial
+        zone_id (str): Zone ID
+
+    Returns:
+        dict: Route output (`avg` is the mean of the received samples)
+    """
+    try:
+        end = float(request.args.get("end", time.time()))
+        window = float(request.args.get("window", 3600))
+        start = float(request.args.get("start", end - window))
+    except ValueError:
+        return {"error": "invalid window"}, 400
+
+    if not all(map(math.isfinite, (start, end, window))) or start > end or window < 0:
+        return {"error": "invalid window"}, 400
+
+    stats = OCCUPANCY_STORE.query(f"{camera_serial}-{zone_id}", start, end)
+    if stats is None:
+        return {"error": "no samples"}, 404
+
+    return stats
+
+
+@app.route('/breakers', methods=["GET"])
+def breakers():
+    """Get the dependencies circuit breaker states.
+
+    Returns:
+        dict: Route output
+    """
+    return get_breaker_states()
+
+
 #############
 # Test routes
 
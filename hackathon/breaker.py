@@ -0,0 +1,234 @@
+"""Circuit breakers for outbound dependencies."""
+
+import collections
+import functools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from . import config
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+# Registered breakers: dependency name as a key
+BREAKERS: Dict[str, "CircuitBreaker"] = {}
+BREAKERS_LOCK = threading.Lock()
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is rejected by an open circuit."""
+
+    def __init__(self, name: str):
+        super().__init__(f"Circuit '{name}' is open")
+        self.name = name
+
+
+class CircuitBreaker:
+    """Track failures of a dependency and reject calls while it is down.
+
+    The circuit opens after `failure_threshold` consecutive failures. Once
+    `recovery_timeout` seconds elapsed, up to `half_open_max_calls` probe calls
+    are let through: a success closes the circuit, a failure opens it again.
+
+    Args:
+        name (str): Dependency name
+        failure_threshold (int): Consecutive failures before opening
+        recovery_timeout (float): Seconds before probing an open circuit
+        half_open_max_calls (int): Concurrent probe calls while half-open
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 3, recovery_timeout: float = 30.0,
+                 half_open_max_calls: int = 1):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Get the current state.
+
+        Returns:
+            str: Circuit state
+        """
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._probes = 0
+        return self._state
+
+    def allow_request(self) -> bool:
+        """Check if a call can go through, reserving a probe when half-open.
+
+        Returns:
+            bool: True if the call is allowed
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and self._probes < self.half_open_max_calls:
+                self._probes += 1
+                return True
+            return False
+
+    def record_success(self):
+        """Record a successful call."""
+        with self._lock:
+            if self._state != CLOSED:
+                logger.info(f"Circuit '{self.name}' closed")
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self):
+        """Record a failed call."""
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened after {self._failures} failure(s)")
+                self._state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+    def to_dict(self) -> dict:
+        """Get a breaker summary.
+
+        Returns:
+            dict: Breaker state and failure count
+        """
+        with self._lock:
+            return {
+                "state": self._current_state(),
+                "failures": self._failures
+            }
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """Get or create the breaker of a dependency.
+
+    Args:
+        name (str): Dependency name (e.g. "data_api", "meraki", "t10:<ip>")
+
+    Returns:
+        CircuitBreaker: Breaker
+    """
+    with BREAKERS_LOCK:
+        breaker = BREAKERS.get(name)
+        if breaker is None:
+            breaker = CircuitBreaker(name, config.BREAKER_FAILURE_THRESHOLD, config.BREAKER_RECOVERY_TIMEOUT)
+            BREAKERS[name] = breaker
+        return breaker
+
+
+def get_breaker_states() -> dict:
+    """Get all breaker states.
+
+    Returns:
+        dict: Breaker summaries, by dependency name
+    """
+    with BREAKERS_LOCK:
+        breakers = list(BREAKERS.values())
+    return {breaker.name: breaker.to_dict() for breaker in breakers}
+
+
+def is_server_error(response: Any) -> bool:
+    """Check if an HTTP response is a server error.
+
+    Args:
+        response (Any): HTTP response
+
+    Returns:
+        bool: True on 5xx status codes
+    """
+    return getattr(response, "status_code", 0) >= 500
+
+
+def protect(name: str, cache: bool = False, is_failure: Optional[Callable[[Any], bool]] = None,
+            cache_size: int = 128):
+    """Guard a function with the breaker of a dependency.
+
+    Calls are rejected with `CircuitOpenError` while the circuit is open. When
+    `cache` is set, the last successful result for the same arguments is
+    returned instead of failing (degraded result), as long as it is not older
+    than `BREAKER_CACHE_TTL` seconds.
+
+    Args:
+        name (str): Dependency name
+        cache (bool): Serve the last successful result when the dependency is down
+        is_failure (Optional[Callable[[Any], bool]]): Tell if a returned result is a failure
+        cache_size (int): Maximum cached results
+
+    Returns:
+        Callable: Decorator
+    """
+    def decorator(func):
+        results = collections.OrderedDict()
+        results_lock = threading.Lock()
+
+        def get_cached(key) -> Tuple[bool, Any]:
+            with results_lock:
+                if key not in results:
+                    return False, None
+                cached_at, result = results[key]
+                if time.monotonic() - cached_at > config.BREAKER_CACHE_TTL:
+                    del results[key]
+                    return False, None
+                return True, result
+
+        def fallback(key, err: Exception):
+            if cache:
+                found, result = get_cached(key)
+                if found:
+                    logger.warning(f"Serving cached result for '{func.__name__}': {err}")
+                    return result
+            raise err
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            breaker = get_breaker(name)
+            key = (args, tuple(sorted(kwargs.items()))) if cache else None
+
+            if not breaker.allow_request():
+                return fallback(key, CircuitOpenError(name))
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as err:
+                breaker.record_failure()
+                return fallback(key, err)
+
+            if is_failure is not None and is_failure(result):
+                breaker.record_failure()
+                if cache:
+                    found, cached = get_cached(key)
+                    if found:
+                        return cached
+                return result
+
+            breaker.record_success()
+            if cache:
+                with results_lock:
+                    results[key] = (time.monotonic(), result)
+                    results.move_to_end(key)
+                    while len(results) > cache_size:
+                        results.popitem(last=False)
+            return result
+
+        return wrapper
+
+    return decorator
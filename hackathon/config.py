@@ -7,6 +7,17 @@ Configuration variables.
 - BOT_URL (str):                        Bot URL
 - MQTT_BROKER_URL (str):                MQTT broker URL
 - MQTT_BROKER_PORT (int):               MQTT broker port
+- T10_MAX_IN_FLIGHT (int):              Maximum concurrent message sends per T10
+- T10_MAX_QUEUE (int):                  Maximum pending T10 messages per room, oldest dropped first
+- DATA_API_TIMEOUT (float):             Data API request timeout, in seconds
+- MERAKI_API_TIMEOUT (float):           Meraki API request timeout, in seconds
+- BREAKER_FAILURE_THRESHOLD (int):      Consecutive failures before opening a circuit
+- BREAKER_RECOVERY_TIMEOUT (float):     Seconds before probing an open circuit
+- BREAKER_CACHE_TTL (float):            Maximum age of cached results served by open circuits, in seconds
+- T10_TIMEOUT (float):                  T10 message send timeout, in seconds
+- MEETING_INDEX_REFRESH (float):        Meeting index refresh interval, in seconds
+- MEETING_INDEX_HORIZON (float):        Meeting index time span around now, in seconds
+- MEETING_INDEX_MAX_AGE (float):        Maximum meeting index age before using the data API again, in seconds
 """
 
 MERAKI_CAMERAS = []
@@ -16,6 +27,17 @@ MQTT_BROKER_URL = "mqtt.ciscodemos.co"
 MQTT_BROKER_PORT = 1883
 ROOM_DATA = {}
 DATA_API_BASE_URL = ""
+T10_MAX_IN_FLIGHT = 1
+T10_MAX_QUEUE = 20
+DATA_API_TIMEOUT = 5
+MERAKI_API_TIMEOUT = 10
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RECOVERY_TIMEOUT = 30
+BREAKER_CACHE_TTL = 300
+T10_TIMEOUT = 10
+MEETING_INDEX_REFRESH = 60
+MEETING_INDEX_HORIZON = 86400
+MEETING_INDEX_MAX_AGE = 300
 try:
     from .local_config import *
 except ImportError:
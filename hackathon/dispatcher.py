@@ -0,0 +1,182 @@
+"""T10 outbound message dispatcher."""
+
+import asyncio
+import collections
+import concurrent.futures
+import logging
+import threading
+from typing import Awaitable, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+SendFunc = Callable[[str, str, str, dict], Awaitable[dict]]
+
+
+def is_superseded(pending: dict, message: dict) -> bool:
+    """Check if a pending message is superseded by a newer message.
+
+    Args:
+        pending (dict): Pending message
+        message (dict): Newer message
+
+    Returns:
+        bool: True if both messages have the same type, target and `first` flag
+    """
+    return all(pending.get(key) == message.get(key) for key in ("messageId", "username", "first"))
+
+
+def cancel_entry(entry: dict):
+    """Cancel a queued message future.
+
+    Args:
+        entry (dict): Queue entry
+    """
+    entry["future"].cancel()
+    entry["future"].set_running_or_notify_cancel()
+
+
+class T10Dispatcher:
+    """Dispatch outbound messages to T10 devices.
+
+    Messages are queued in a FIFO per room and drained by one worker per room,
+    so a room always receives its messages in order. A pending message is
+    dropped when a newer message for the same room and device has the same
+    `messageId`, `username` and `first` flag (e.g. a repeated warn or late
+    choice for one person); the newer message is queued at the end.
+    A room queue holds at most `max_queue` messages: the oldest ones are
+    dropped on overflow. Sends to different rooms run in parallel, limited by
+    a cap on in-flight sends per device.
+
+    Args:
+        send_func (SendFunc): Coroutine function sending a JSON message to a device
+        max_in_flight (int): Maximum concurrent sends per device
+        max_queue (int): Maximum pending messages per room
+    """
+
+    def __init__(self, send_func: SendFunc, max_in_flight: int = 1, max_queue: int = 20):
+        self._send_func = send_func
+        self._max_in_flight = max(1, max_in_flight)
+        self._max_queue = max(1, max_queue)
+        self._lock = threading.Lock()
+        self._queues: Dict[str, collections.deque] = {}
+        self._active_rooms = set()
+        self._in_flight: Dict[str, int] = collections.Counter()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._coalesced = 0
+        self._dropped = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the dispatcher event loop thread if needed.
+
+        Returns:
+            asyncio.AbstractEventLoop: Dispatcher loop
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=self._loop.run_forever, name="t10-dispatcher", daemon=True)
+            thread.start()
+        return self._loop
+
+    def enqueue(self, ip: str, username: str, password: str, message: dict,
+                room_id: Optional[str] = None) -> concurrent.futures.Future:
+        """Queue a JSON message for a T10.
+
+        Args:
+            ip (str): Device IP
+            username (str): Username
+            password (str): Password
+            message (dict): Message to send
+            room_id (Optional[str]): Room ID, defaults to the device IP
+
+        Returns:
+            concurrent.futures.Future: Send response, cancelled if superseded or dropped before sending
+        """
+        room_key = room_id or ip
+        message_id = message.get("messageId")
+        future = concurrent.futures.Future()
+
+        with self._lock:
+            loop = self._ensure_loop()
+            queue = self._queues.setdefault(room_key, collections.deque())
+
+            for entry in list(queue):
+                if entry["ip"] == ip and message_id is not None and is_superseded(entry["message"], message):
+                    logger.info(f"Message {message_id} for {message.get('username')} in room {room_key} "
+                                f"superseded by a newer one")
+                    queue.remove(entry)
+                    cancel_entry(entry)
+                    self._coalesced += 1
+
+            queue.append({
+                "ip": ip,
+                "username": username,
+                "password": password,
+                "message": message,
+                "future": future
+            })
+
+            while len(queue) > self._max_queue:
+                entry = queue.popleft()
+                logger.warning(f"Room {room_key} queue is full, dropping message {entry['message'].get('messageId')}")
+                cancel_entry(entry)
+                self._dropped += 1
+
+            if room_key not in self._active_rooms:
+                self._active_rooms.add(room_key)
+                asyncio.run_coroutine_threadsafe(self._drain(room_key), loop)
+
+        return future
+
+    async def _drain(self, room_key: str):
+        """Send queued messages for a room, in order.
+
+        Args:
+            room_key (str): Room key
+        """
+        while True:
+            with self._lock:
+                queue = self._queues.get(room_key)
+                if not queue:
+                    self._queues.pop(room_key, None)
+                    self._active_rooms.discard(room_key)
+                    return
+                entry = queue.popleft()
+
+            if not entry["future"].set_running_or_notify_cancel():
+                continue
+
+            ip = entry["ip"]
+            semaphore = self._semaphores.setdefault(ip, asyncio.Semaphore(self._max_in_flight))
+            async with semaphore:
+                with self._lock:
+                    self._in_flight[ip] += 1
+                try:
+                    result = await self._send_func(ip, entry["username"], entry["password"], entry["message"])
+                    entry["future"].set_result(result)
+                except Exception as err:
+                    logger.error(f"Could not send message to T10 {ip}: {err}")
+                    entry["future"].set_exception(err)
+                finally:
+                    with self._lock:
+                        self._in_flight[ip] -= 1
+                        if not self._in_flight[ip]:
+                            del self._in_flight[ip]
+
+    def backlog(self) -> dict:
+        """Get the current dispatcher backlog.
+
+        Returns:
+            dict: Pending messages per room, in-flight sends per device
+        """
+        with self._lock:
+            return {
+                "rooms": {
+                    room_key: [entry["message"].get("messageId") for entry in queue]
+                    for room_key, queue in self._queues.items()
+                },
+                "pending": sum(len(queue) for queue in self._queues.values()),
+                "in_flight": dict(self._in_flight),
+                "coalesced": self._coalesced,
+                "dropped": self._dropped
+            }
@@ -0,0 +1,183 @@
+"""Occupancy aggregation from Meraki MV zone counts."""
+
+import array
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+# Default series resolutions: (bucket size in seconds, bucket count)
+# 1s buckets over 1 hour, 1m buckets over 1 day, 1h buckets over 30 days
+DEFAULT_RESOLUTIONS = [(1, 3600), (60, 1440), (3600, 720)]
+
+
+class RingSeries:
+    """Fixed-size ring buffer of people count buckets at a given resolution.
+
+    Each bucket keeps the sample count, sum, min and max of the counts
+    received during its time span, in array-backed storage.
+
+    Args:
+        resolution (int): Bucket size, in seconds
+        slots (int): Bucket count
+    """
+
+    def __init__(self, resolution: int, slots: int):
+        self.resolution = resolution
+        self.slots = slots
+        self.buckets = array.array("q", [-1]) * slots
+        self.samples = array.array("L", [0]) * slots
+        self.sums = array.array("d", [0.0]) * slots
+        self.mins = array.array("l", [0]) * slots
+        self.maxs = array.array("l", [0]) * slots
+
+    @property
+    def retention(self) -> int:
+        """Get the covered time span.
+
+        Returns:
+            int: Retention, in seconds
+        """
+        return self.resolution * self.slots
+
+    def add(self, timestamp: float, count: int):
+        """Fold a people count into its bucket.
+
+        Args:
+            timestamp (float): Sample timestamp
+            count (int): People count
+        """
+        bucket = int(timestamp // self.resolution)
+        idx = bucket % self.slots
+
+        if bucket < self.buckets[idx]:
+            # Sample older than the slot content, already out of the retention
+            return
+
+        if self.buckets[idx] != bucket:
+            self.buckets[idx] = bucket
+            self.samples[idx] = 1
+            self.sums[idx] = count
+            self.mins[idx] = count
+            self.maxs[idx] = count
+            return
+
+        self.samples[idx] += 1
+        self.sums[idx] += count
+        if count < self.mins[idx]:
+            self.mins[idx] = count
+        if count > self.maxs[idx]:
+            self.maxs[idx] = count
+
+    def query(self, start: float, end: float) -> Optional[dict]:
+        """Aggregate the buckets overlapping a time window.
+
+        Args:
+            start (float): Window start timestamp
+            end (float): Window end timestamp
+
+        Returns:
+            Optional[dict]: Aggregated stats, None without samples. `avg` is the
+                mean of the received samples (not time-weighted) and `peak_at` the
+                start timestamp of the first bucket reaching `max`.
+        """
+        last = int(end // self.resolution)
+        first = max(int(start // self.resolution), last - self.slots + 1)
+
+        samples = 0
+        total = 0.0
+        minimum = None
+        maximum = None
+        peak_bucket = None
+
+        for bucket in range(first, last + 1):
+            idx = bucket % self.slots
+            if self.buckets[idx] != bucket:
+                continue
+
+            samples += self.samples[idx]
+            total += self.sums[idx]
+            if minimum is None or self.mins[idx] < minimum:
+                minimum = self.mins[idx]
+            if maximum is None or self.maxs[idx] > maximum:
+                maximum = self.maxs[idx]
+                peak_bucket = bucket
+
+        if not samples:
+            return None
+
+        return {
+            "min": minimum,
+            "max": maximum,
+            "avg": total / samples,
+            "peak_at": peak_bucket * self.resolution,
+            "samples": samples,
+            "resolution": self.resolution
+        }
+
+
+class OccupancyStore:
+    """Multi-resolution occupancy store, with one set of series per zone.
+
+    Memory is bounded by the zone count: each zone holds a fixed number of
+    buckets per resolution, whatever the process uptime.
+
+    Args:
+        resolutions (List[Tuple[int, int]]): (bucket size in seconds, bucket count) list
+    """
+
+    def __init__(self, resolutions: List[Tuple[int, int]] = None):
+        self.resolutions = sorted(resolutions or DEFAULT_RESOLUTIONS)
+        self._lock = threading.Lock()
+        self._zones: Dict[str, List[RingSeries]] = {}
+
+    def record(self, zone_key: str, count: int, timestamp: Optional[float] = None):
+        """Record a zone people count.
+
+        Args:
+            zone_key (str): Zone key (`<serial>-<zone_id>`)
+            count (int): People count
+            timestamp (Optional[float]): Sample timestamp, defaults to now
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+
+        with self._lock:
+            series = self._zones.get(zone_key)
+            if series is None:
+                series = [RingSeries(resolution, slots) for resolution, slots in self.resolutions]
+                self._zones[zone_key] = series
+
+            for ring in series:
+                ring.add(timestamp, count)
+
+    def query(self, zone_key: str, start: float, end: Optional[float] = None) -> Optional[dict]:
+        """Get min/max/avg people counts of a zone over a time window.
+
+        The finest resolution still covering the window start is used.
+
+        Args:
+            zone_key (str): Zone key (`<serial>-<zone_id>`)
+            start (float): Window start timestamp
+            end (Optional[float]): Window end timestamp, defaults to now
+
+        Returns:
+            Optional[dict]: Aggregated stats, None without samples
+        """
+        now = time.time()
+        end = now if end is None else min(end, now)
+
+        with self._lock:
+            series = self._zones.get(zone_key)
+            if series is None:
+                return None
+
+            ring = next((x for x in series if now - start < x.retention), series[-1])
+            return ring.query(start, end)
+
+    def zones(self) -> List[str]:
+        """Get the recorded zone keys.
+
+        Returns:
+            List[str]: Zone keys
+        """
+        with self._lock:
+            return list(self._zones)
@@ -0,0 +1,184 @@
+"""Local meeting schedule index."""
+
+import bisect
+import collections
+import logging
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Indexed meetings: (sorted start timestamps, end timestamps, meetings)
+Entries = Tuple[List[float], List[float], List[dict]]
+
+
+def parse_timestamp(value) -> float:
+    """Parse a meeting time.
+
+    Args:
+        value (Union[int, float, str]): Epoch timestamp or ISO 8601 date
+
+    Returns:
+        float: Epoch timestamp
+    """
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str) and value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    return datetime.fromisoformat(value).timestamp()
+
+
+class MeetingIndex:
+    """Meeting schedule index, by room.
+
+    Meetings are kept in lists sorted by start time, so lookups are binary
+    searches. Meetings of a same room are expected not to overlap. The index
+    is rebuilt in bulk on `load` and is only `ready` while its last load is
+    younger than `max_age` seconds.
+
+    Args:
+        rooms (Iterable[str]): Known rooms, even without meetings
+        max_age (float): Maximum index age, in seconds
+    """
+
+    def __init__(self, rooms: Iterable[str] = (), max_age: float = 300):
+        self._lock = threading.Lock()
+        self._known_rooms = set(rooms)
+        self._rooms: Dict[str, Entries] = {}
+        self.max_age = max_age
+        self.loaded_at: Optional[float] = None
+
+    @property
+    def ready(self) -> bool:
+        """Check if the index has been loaded recently enough to be used.
+
+        Returns:
+            bool: True if loaded less than `max_age` seconds ago
+        """
+        loaded_at = self.loaded_at
+        return loaded_at is not None and time.time() - loaded_at < self.max_age
+
+    @staticmethod
+    def _build(groups: Dict[str, List[Tuple[float, float, dict]]]) -> Dict[str, Entries]:
+        index = {}
+        for key, entries in groups.items():
+            entries.sort(key=lambda x: x[0])
+            index[key] = ([x[0] for x in entries], [x[1] for x in entries], [x[2] for x in entries])
+        return index
+
+    def load(self, meetings: List[dict]):
+        """Replace the indexed meetings.
+
+        Args:
+            meetings (List[dict]): Meetings, with `room`, `start` and `end` keys
+
+        Raises:
+            TypeError: If meetings is not a list
+            ValueError: If none of the meetings is valid
+        """
+        if not isinstance(meetings, list):
+            raise TypeError(f"Expected a meetings list, got {type(meetings).__name__}")
+
+        rooms = collections.defaultdict(list)
+
+        for meeting in meetings:
+            try:
+                start = parse_timestamp(meeting["start"])
+                end = parse_timestamp(meeting["end"])
+            except (KeyError, TypeError, ValueError) as err:
+                logger.warning(f"Skipping invalid meeting {meeting}: {err}")
+                continue
+
+            rooms[meeting.get("room")].append((start, end, meeting))
+
+        if meetings and not rooms:
+            raise ValueError(f"No valid meeting in {len(meetings)} meeting(s)")
+
+        rooms_index = self._build(rooms)
+
+        with self._lock:
+            self._rooms = rooms_index
+            self.loaded_at = time.time()
+
+    @staticmethod
+    def _index_at(entries: Optional[Entries], now: float) -> Optional[int]:
+        if not entries:
+            return None
+        starts, ends, _ = entries
+        idx = bisect.bisect_right(starts, now) - 1
+        if idx >= 0 and ends[idx] > now:
+            return idx
+        return None
+
+    @staticmethod
+    def _index_after(entries: Optional[Entries], now: float) -> Optional[int]:
+        if not entries:
+            return None
+        idx = bisect.bisect_right(entries[0], now)
+        if idx < len(entries[0]):
+            return idx
+        return None
+
+    def current_meeting(self, room_id: str, now: Optional[float] = None) -> Optional[dict]:
+        """Get the current meeting of a room.
+
+        Args:
+            room_id (str): Room ID
+            now (Optional[float]): Reference timestamp, defaults to now
+
+        Returns:
+            Optional[dict]: Meeting information
+        """
+        now = time.time() if now is None else now
+        entries = self._rooms.get(room_id)
+        idx = self._index_at(entries, now)
+        return None if idx is None else entries[2][idx]
+
+    def available_rooms(self, meeting_length: int, now: Optional[float] = None) -> List[str]:
+        """Get rooms free for a given duration.
+
+        Args:
+            meeting_length (int): Meeting length, in minutes
+            now (Optional[float]): Reference timestamp, defaults to now
+
+        Returns:
+            List[str]: Room IDs
+        """
+        now = time.time() if now is None else now
+        until = now + meeting_length * 60
+        rooms_index = self._rooms
+
+        available = []
+        for room_id in sorted(self._known_rooms.union(x for x in rooms_index if x is not None)):
+            entries = rooms_index.get(room_id)
+            if self._index_at(entries, now) is not None:
+                continue
+            upcoming = self._index_after(entries, now)
+            if upcoming is None or entries[0][upcoming] >= until:
+                available.append(room_id)
+
+        return available
+
+    def start_refresh(self, fetch: Callable[[], List[dict]], interval: float) -> threading.Thread:
+        """Periodically reload the index in a background thread.
+
+        Args:
+            fetch (Callable[[], List[dict]]): Meetings loader
+            interval (float): Refresh interval, in seconds
+
+        Returns:
+            threading.Thread: Refresh thread
+        """
+        def refresh():
+            while True:
+                try:
+                    self.load(fetch())
+                except Exception as err:
+                    logger.error(f"Could not refresh meeting index: {err}")
+                time.sleep(interval)
+
+        thread = threading.Thread(target=refresh, name="meeting-index", daemon=True)
+        thread.start()
+        return thread
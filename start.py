@@ -1,4 +1,9 @@
 """Starting script."""
 
-from hackathon.app import app
+from hackathon import config
+from hackathon.app import MEETING_INDEX, app, fetch_meetings
+
+if config.DATA_API_BASE_URL:
+    MEETING_INDEX.start_refresh(fetch_meetings, config.MEETING_INDEX_REFRESH)
+
 app.run(host="0.0.0.0")